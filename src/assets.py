@@ -0,0 +1,304 @@
+"""Static asset pipeline for the single-page frontend.
+
+At startup the inline <style>/<script> blocks of index.html are split out, minified
+and given content-hashed filenames, and every file in the static folder is loaded
+into an in-memory manifest together with gzip/brotli variants. The catch-all route
+then serves from memory without touching the filesystem per request.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+
+from flask import Response
+
+# brotli is optional: without it only gzip variants are produced
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_PREFIX = 'assets/'
+# fingerprinted files never change under the same name
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# index.html keeps a stable URL, so browsers must revalidate it (cheap thanks to the ETag)
+INDEX_CACHE = 'no-cache'
+STATIC_CACHE = 'public, max-age=86400'
+
+_INLINE_STYLE_RE = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+_INLINE_SCRIPT_RE = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+
+
+class Asset:
+    """A static file held in memory with its precompressed variants."""
+
+    def __init__(self, body, mimetype, cache_control):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {'identity': body}
+        # keep a compressed variant only when it is a real saving (skips png/jpg etc.)
+        compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['br'] = brotli.compress(body, quality=11)
+        for encoding, data in compressed.items():
+            if len(data) < len(body) * 0.9:
+                self.variants[encoding] = data
+
+    def pick_encoding(self, accept_encodings):
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return 'identity'
+
+
+def _fingerprint(body):
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+# comments are dropped; strings and url(...) tokens are copied through untouched
+_CSS_TOKEN_RE = re.compile(r"""(/\*.*?\*/|"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|url\([^)]*\))""", re.DOTALL)
+
+
+def _minify_css_segment(css):
+    css = re.sub(r'\s+', ' ', css)
+    # spaces before ':' are significant in selectors (descendant pseudo-classes), so leave them
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}')
+
+
+def minify_css(css):
+    parts = []
+    for i, part in enumerate(_CSS_TOKEN_RE.split(css)):
+        if i % 2 == 0:
+            parts.append(_minify_css_segment(part))
+        elif not part.startswith('/*'):
+            parts.append(part)
+    return ''.join(parts).strip()
+
+
+# a '/' after one of these (or a keyword below) starts a regex literal rather than a division
+_JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'yield', 'await')
+
+
+def _scan_js_lines(js):
+    """Report, for each line, whether it starts and ends in plain code.
+
+    Tracks quoted strings, template literals (including nested ${...} expressions),
+    comments and regex literals. Returns None if the source cannot be scanned cleanly,
+    e.g. an unterminated string or a construct the scanner does not understand.
+    """
+    starts, ends = [], []
+    # stack of 'template' / 'expr' (a ${...} inside a template) / 'brace'
+    stack = []
+    mode = None  # None (code) | "'" | '"' | 'line_comment' | 'block_comment'
+    prev = ''  # last significant code character, used to tell regexes from division
+    word = ''  # identifier ending at `prev`, for keywords such as `return /re/`
+
+    def in_code():
+        return mode is None and (not stack or stack[-1] != 'template')
+
+    starts.append(True)
+    i, n = 0, len(js)
+    while i < n:
+        ch = js[i]
+        nxt = js[i + 1] if i + 1 < n else ''
+        if ch == '\n':
+            if mode in ("'", '"'):
+                return None
+            if mode == 'line_comment':
+                mode = None
+            ends.append(in_code())
+            starts.append(in_code())
+            i += 1
+            continue
+        if mode == 'line_comment':
+            i += 1
+        elif mode == 'block_comment':
+            if ch == '*' and nxt == '/':
+                mode = None
+                i += 2
+            else:
+                i += 1
+        elif mode in ("'", '"'):
+            if ch == '\\':
+                i += 2
+            else:
+                if ch == mode:
+                    mode = None
+                    prev, word = ch, ''
+                i += 1
+        elif stack and stack[-1] == 'template':
+            if ch == '\\':
+                i += 2
+            elif ch == '`':
+                stack.pop()
+                prev, word = ch, ''
+                i += 1
+            elif ch == '$' and nxt == '{':
+                stack.append('expr')
+                prev, word = '{', ''
+                i += 2
+            else:
+                i += 1
+        else:
+            if ch in ' \t\r':
+                i += 1
+                continue
+            if ch == '/' and nxt == '/':
+                mode = 'line_comment'
+                i += 2
+                continue
+            if ch == '/' and nxt == '*':
+                mode = 'block_comment'
+                i += 2
+                continue
+            if ch == '/' and (prev == '' or prev in _JS_REGEX_PRECEDERS or word in _JS_REGEX_KEYWORDS):
+                i += 1
+                in_class = False
+                while True:
+                    if i >= n or js[i] == '\n':
+                        return None
+                    c = js[i]
+                    if c == '\\':
+                        i += 2
+                        continue
+                    i += 1
+                    if c == '[':
+                        in_class = True
+                    elif c == ']':
+                        in_class = False
+                    elif c == '/' and not in_class:
+                        break
+                while i < n and (js[i].isalnum() or js[i] == '_'):
+                    i += 1  # flags
+                prev, word = ')', ''  # a regex behaves like an operand
+                continue
+            if ch in ("'", '"'):
+                mode = ch
+            elif ch == '`':
+                stack.append('template')
+            elif ch == '{':
+                stack.append('brace')
+            elif ch == '}':
+                if not stack:
+                    return None
+                stack.pop()
+            if ch.isalnum() or ch in '_$':
+                word = word + ch if prev and (prev.isalnum() or prev in '_$') else ch
+            else:
+                word = ''
+            prev = ch
+            i += 1
+    if mode not in (None, 'line_comment') or stack:
+        return None
+    ends.append(in_code())
+    return starts, ends
+
+
+def minify_js(js):
+    """Conservative, line-based JS minification.
+
+    Indentation, blank lines and whole-line // comments are removed, but line breaks are
+    kept so automatic semicolon insertion behaves the same. Whitespace that belongs to a
+    string, template literal or comment is left untouched. If the source cannot be
+    scanned safely it is returned unchanged.
+    """
+    source_lines = js.split('\n')
+    scanned = _scan_js_lines(js)
+    if scanned is None:
+        return js
+    starts, ends = scanned
+    lines = []
+    for line, starts_in_code, ends_in_code in zip(source_lines, starts, ends):
+        if starts_in_code:
+            line = line.lstrip()
+            if line.startswith('//') or (not line and ends_in_code):
+                continue
+        if ends_in_code:
+            line = line.rstrip()
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def minify_html(html):
+    # leading indentation is never significant outside <pre>, which the frontend does not use
+    lines = (line.strip() for line in html.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def split_inline_assets(html):
+    """Move inline <style>/<script> blocks into fingerprinted files.
+
+    Returns the rewritten HTML and a dict of {relative path: bytes}.
+    """
+    bundles = {}
+
+    def extract(source, ext, minify):
+        body = minify(source).encode('utf-8')
+        name = f'{ASSET_PREFIX}index.{_fingerprint(body)}.{ext}'
+        bundles[name] = body
+        return name
+
+    def replace_style(match):
+        return f'<link rel="stylesheet" href="/{extract(match.group(1), "css", minify_css)}">'
+
+    def replace_script(match):
+        return f'<script src="/{extract(match.group(1), "js", minify_js)}"></script>'
+
+    html = _INLINE_STYLE_RE.sub(replace_style, html)
+    html = _INLINE_SCRIPT_RE.sub(replace_script, html)
+    return html, bundles
+
+
+def _guess_type(path):
+    mimetype, _ = mimetypes.guess_type(path)
+    return mimetype or 'application/octet-stream'
+
+
+def build_manifest(static_folder):
+    """Load the static folder into memory, keyed by URL path relative to the site root."""
+    manifest = {}
+    index_html = None
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            full_path = os.path.join(root, name)
+            rel_path = os.path.relpath(full_path, static_folder).replace(os.sep, '/')
+            with open(full_path, 'rb') as f:
+                body = f.read()
+            if rel_path == 'index.html':
+                index_html = body.decode('utf-8')
+            else:
+                manifest[rel_path] = Asset(body, _guess_type(rel_path), STATIC_CACHE)
+
+    if index_html is not None:
+        html, bundles = split_inline_assets(index_html)
+        for rel_path, body in bundles.items():
+            manifest[rel_path] = Asset(body, _guess_type(rel_path), IMMUTABLE_CACHE)
+        manifest['index.html'] = Asset(minify_html(html).encode('utf-8'), 'text/html', INDEX_CACHE)
+    return manifest
+
+
+def resolve_asset(manifest, path):
+    """Find the asset for a request path, falling back to index.html for client-side routes."""
+    asset = manifest.get(path)
+    if asset is not None:
+        return asset
+    # an unknown fingerprinted file (e.g. from a previous deploy) must not be answered with HTML
+    if path.startswith(ASSET_PREFIX):
+        return None
+    return manifest.get('index.html')
+
+
+def send_asset(asset, request):
+    encoding = asset.pick_encoding(request.accept_encodings)
+    response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = asset.cache_control
+    response.set_etag(f'{asset.etag}-{encoding}')
+    return response.make_conditional(request)
@@ -6,12 +6,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from dotenv import load_dotenv
 load_dotenv()
 
-from flask import Flask, send_from_directory
+from flask import Flask, request
 from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
 from src.routes.note import note_bp
-from src.models.note import Note
+from src.models.note import Note, migrate_legacy_translations
+from src.assets import build_manifest, resolve_asset, send_asset
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 # Load secret from environment (or fallback to previous hard-coded value)
@@ -70,27 +71,30 @@ with app.app_context():
     # The reloader child process sets WERKZEUG_RUN_MAIN='true'. For non-debug runs, this will run once.
     if (not app.debug) or (os.environ.get('WERKZEUG_RUN_MAIN') == 'true'):
         db.create_all()
+        migrate_legacy_translations()
     # NOTE: Do NOT start the in-process background translation worker here on import.
     # Starting background threads during module import is unsafe in serverless environments
     # (like Vercel) because processes may be short-lived and multiple imports may happen.
     # To start the in-process worker for local development, set the env var
     # START_IN_PROCESS_WORKER=1 and run this module directly (python -m src.main or python src/main.py).
 
+# Build the static asset manifest once at startup (split/minified/fingerprinted bundles
+# with precompressed variants) so the catch-all route serves from memory without per-request stats.
+# Restart the server to pick up edits to files under src/static.
+asset_manifest = build_manifest(app.static_folder) if app.static_folder else {}
+
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
+    if app.static_folder is None:
+        return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
+    asset = resolve_asset(asset_manifest, path)
+    if asset is None:
+        if 'index.html' not in asset_manifest:
             return "index.html not found", 404
+        return "Not found", 404
+    return send_asset(asset, request)
 
 
 if __name__ == '__main__':
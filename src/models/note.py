@@ -1,17 +1,32 @@
+import hashlib
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from src.models.user import db
 
 
+# translation target used when a note has no language set
+DEFAULT_LANGUAGE = 'en'
+# language codes offered by the frontend; translations are only generated for these
+SUPPORTED_LANGUAGES = ('en', 'zh', 'es', 'fr', 'de')
+
+
+def compute_source_hash(title, content):
+    """Fingerprint of a note's title and content, used to detect stale translations."""
+    digest = hashlib.sha256()
+    digest.update((title or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update((content or '').encode('utf-8'))
+    return digest.hexdigest()
+
+
 class Note(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     # optional original language code (e.g., 'en', 'zh')
     language = db.Column(db.String(16), nullable=True)
-    # translated copies (if translation requested)
-    translated_title = db.Column(db.String(200), nullable=True)
-    translated_content = db.Column(db.Text, nullable=True)
     # tags stored as comma-separated string (saved/served as list)
     tags = db.Column(db.Text, nullable=True)
     # translation status: None | 'pending' | 'completed' | 'failed'
@@ -22,25 +37,151 @@ class Note(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # translated copies, one per language; loaded in a single extra query for list views
+    translations = db.relationship('NoteTranslation', backref='note', lazy='selectin',
+                                   cascade='all, delete-orphan')
+
     def __repr__(self):
         return f'<Note {self.title}>'
 
-    def to_dict(self):
+    def source_hash(self):
+        return compute_source_hash(self.title, self.content)
+
+    def target_language(self):
+        return self.language or DEFAULT_LANGUAGE
+
+    def translation_for(self, language):
+        """Return the up-to-date translation into `language`, or None if missing or stale."""
+        if not language:
+            return None
+        current = self.source_hash()
+        for translation in self.translations:
+            if translation.language == language and translation.source_hash == current:
+                return translation
+        return None
+
+    def to_dict(self, language=None):
         tags_list = []
         if self.tags:
             # split by comma and strip whitespace, ignore empty
             tags_list = [t.strip() for t in self.tags.split(',') if t.strip()]
 
+        # default to the note's own target language so list previews keep working
+        translation = self.translation_for(language or self.target_language())
+
         return {
             'id': self.id,
             'title': self.title,
             'content': self.content,
             'language': self.language,
-            'translated_title': self.translated_title,
-            'translated_content': self.translated_content,
+            'translated_title': translation.title if translation else None,
+            'translated_content': translation.content if translation else None,
+            'translation_status': self.translation_status,
             'tags': tags_list,
             'scheduled_at': self.scheduled_at.isoformat() if self.scheduled_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
+class NoteTranslation(db.Model):
+    __tablename__ = 'note_translation'
+    __table_args__ = (
+        db.Index('ix_note_translation_lookup', 'note_id', 'language', 'source_hash', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    note_id = db.Column(db.Integer, db.ForeignKey('note.id', ondelete='CASCADE'), nullable=False)
+    language = db.Column(db.String(16), nullable=False)
+    # hash of the note title/content this translation was produced from
+    source_hash = db.Column(db.String(64), nullable=False)
+    title = db.Column(db.Text, nullable=True)
+    content = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<NoteTranslation {self.note_id} {self.language}>'
+
+    @classmethod
+    def store(cls, note, language, title, content, source_hash=None):
+        """Attach a translation to `note`, replacing any older one for the same language.
+
+        Only the latest revision per language is kept since stale rows are never served.
+        A result for an outdated `source_hash` (e.g. a late worker job after the note was
+        edited) is not stored; the current translation is returned instead, or None if
+        there is none yet. The caller is responsible for committing the session.
+        """
+        current_hash = note.source_hash()
+        source_hash = source_hash or current_hash
+        if source_hash != current_hash:
+            return note.translation_for(language)
+        translation = None
+        for existing in list(note.translations):
+            if existing.language != language:
+                continue
+            if existing.source_hash == source_hash and translation is None:
+                translation = existing
+            else:
+                note.translations.remove(existing)
+        if translation is None:
+            translation = cls(language=language, source_hash=source_hash)
+            note.translations.append(translation)
+        translation.title = title
+        translation.content = content
+        return translation
+
+
+LEGACY_TRANSLATION_COLUMNS = ('translated_title', 'translated_content')
+
+
+def migrate_legacy_translations():
+    """Move translations from the old note.translated_title/translated_content columns.
+
+    Each legacy pair becomes a NoteTranslation for the note's language, fingerprinted
+    against the note's current title/content. Once they are copied the legacy columns
+    are dropped, so later startups stop after the schema check. Several instances may
+    run this at once; whichever loses the race backs off. Must be called inside an
+    app context.
+    """
+    columns = {c['name'] for c in inspect(db.engine).get_columns(Note.__tablename__)}
+    if not set(LEGACY_TRANSLATION_COLUMNS) <= columns:
+        return
+
+    legacy_filter = 'translated_title IS NOT NULL OR translated_content IS NOT NULL'
+    try:
+        rows = db.session.execute(text(
+            f'SELECT id, translated_title, translated_content FROM {Note.__tablename__} WHERE {legacy_filter}'
+        )).all()
+    except SQLAlchemyError:
+        # another instance dropped the columns after our schema check
+        db.session.rollback()
+        return
+
+    if rows:
+        # inserts may flush before the commit (autoflush), so guard the whole write
+        try:
+            for row in rows:
+                note = db.session.get(Note, row.id)
+                if note is None:
+                    continue
+                language = note.target_language()
+                if note.translation_for(language) is None:
+                    NoteTranslation.store(note, language, row.translated_title, row.translated_content)
+            db.session.execute(text(
+                f'UPDATE {Note.__tablename__} SET translated_title = NULL, translated_content = NULL WHERE {legacy_filter}'
+            ))
+            db.session.commit()
+        except IntegrityError:
+            # another instance migrated the same rows first; it will drop the columns
+            db.session.rollback()
+            return
+
+    try:
+        for column in LEGACY_TRANSLATION_COLUMNS:
+            db.session.execute(text(f'ALTER TABLE {Note.__tablename__} DROP COLUMN {column}'))
+        db.session.commit()
+    except SQLAlchemyError:
+        # e.g. SQLite older than 3.35 or a concurrent drop; the columns are empty so this
+        # only costs another SELECT on the next startup
+        db.session.rollback()
@@ -1,11 +1,19 @@
 from flask import Blueprint, jsonify, request
-from src.models.note import Note, db
+from src.models.note import Note, NoteTranslation, SUPPORTED_LANGUAGES, db
 from datetime import datetime
 from src import llm
 from src.translation_worker import enqueue_translation
 
 note_bp = Blueprint('note', __name__)
 
+
+def _translate_note(note, language):
+    """Translate the note's current title/content and store the result (caller commits)."""
+    trans = llm.translate_text(title=note.title, content=note.content, target_language=language)
+    if not trans:
+        return None
+    return NoteTranslation.store(note, language, trans.get('title'), trans.get('content'))
+
 @note_bp.route('/notes', methods=['GET'])
 def get_notes():
     """Get all notes, ordered by most recently updated"""
@@ -44,7 +52,7 @@ def create_note():
         db.session.commit()
         if translate_flag:
             try:
-                enqueue_translation(note.id, note.title, note.content, language)
+                enqueue_translation(note.id, note.title, note.content, note.target_language())
             except Exception as e:
                 print('Failed to enqueue translation:', e)
         return jsonify(note.to_dict()), 201
@@ -54,9 +62,20 @@ def create_note():
 
 @note_bp.route('/notes/<int:note_id>', methods=['GET'])
 def get_note(note_id):
-    """Get a specific note by ID"""
+    """Get a specific note by ID, optionally translated via ?lang=xx"""
     note = Note.query.get_or_404(note_id)
-    return jsonify(note.to_dict())
+    language = (request.args.get('lang') or '').strip().lower() or None
+    if language and language not in SUPPORTED_LANGUAGES:
+        return jsonify({'error': f"Unsupported language '{language}'"}), 400
+    # only call the model when there is no translation for the current title/content
+    if language and llm.token and note.translation_for(language) is None:
+        try:
+            _translate_note(note, language)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print('Translation failed on fetch:', e)
+    return jsonify(note.to_dict(language=language))
 
 @note_bp.route('/notes/<int:note_id>', methods=['PUT'])
 def update_note(note_id):
@@ -82,13 +101,11 @@ def update_note(note_id):
             except Exception:
                 pass
 
-        # translation on update if requested
-        if data.get('translate'):
+        # translation on update if requested and the stored one is out of date
+        target_language = note.target_language()
+        if data.get('translate') and note.translation_for(target_language) is None:
             try:
-                trans = llm.translate_text(title=note.title, content=note.content, target_language=note.language)
-                if trans:
-                    note.translated_title = trans.get('title')
-                    note.translated_content = trans.get('content')
+                _translate_note(note, target_language)
             except Exception as e:
                 print('Translation failed on update:', e)
         db.session.commit()
@@ -4,7 +4,9 @@ import time
 import traceback
 from typing import Optional
 
-from src.models.note import Note, db
+from sqlalchemy.exc import IntegrityError
+
+from src.models.note import Note, NoteTranslation, compute_source_hash, db
 from src import llm
 
 _task_queue = queue.Queue()
@@ -29,12 +31,24 @@ def _worker_loop(app):
 
                     result = llm.translate_text(title=title, content=content, target_language=target_language)
                     if result:
-                        note.translated_title = result.get('title')
-                        note.translated_content = result.get('content')
-                        note.translation_status = 'completed'
+                        # fingerprint against the enqueued source so later edits make it stale
+                        stored = NoteTranslation.store(note, target_language, result.get('title'), result.get('content'),
+                                                       source_hash=compute_source_hash(title, content))
+                        if stored is None:
+                            # the note was edited while translating; redo it for the current text
+                            note.translation_status = 'pending'
+                            enqueue_translation(note.id, note.title, note.content, target_language)
+                        else:
+                            note.translation_status = 'completed'
                     else:
                         note.translation_status = 'failed'
                     db.session.commit()
+                except IntegrityError:
+                    # a concurrent request stored the same translation first; rollback expires
+                    # the note, so translation_for() reloads and sees that row
+                    db.session.rollback()
+                    note.translation_status = 'completed' if note.translation_for(target_language) else 'failed'
+                    db.session.commit()
                 except Exception:
                     traceback.print_exc()
                     db.session.rollback()
@@ -0,0 +1,60 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+
+from src.assets import _INLINE_SCRIPT_RE, minify_css, minify_js
+
+INDEX_HTML = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src', 'static', 'index.html')
+
+
+def test_minify_css_collapses_whitespace_and_comments():
+    css = '/* header */\n.a > .b ,\n.c :hover {\n    color: red ;\n}\n'
+    assert minify_css(css) == '.a>.b,.c :hover{color:red}'
+
+
+def test_minify_css_leaves_strings_and_urls_untouched():
+    css = ('a { content: "x, y" ; quotes: \'{ ; }\' \'> \'; }\n'
+           '.d { background: url( a b.png ) no-repeat; font-family: "A ; B", sans-serif }')
+    assert minify_css(css) == ('a{content:"x, y";quotes:\'{ ; }\' \'> \'}'
+                               '.d{background:url( a b.png ) no-repeat;font-family:"A ; B",sans-serif}')
+
+
+def test_minify_js_keeps_template_literals_after_quoted_backtick():
+    js = 'const a = "it\'s `";\nconst t = `\n    // keep\n`;'
+    assert minify_js(js) == js
+
+
+def test_minify_js_strips_indentation_and_comment_lines():
+    js = '  x = a / b;\n  // note\n\n  y = /[/`]x/g.test(s);\n  z = `a ${ {k: `in\n  ner`}.k }`;'
+    assert minify_js(js) == 'x = a / b;\ny = /[/`]x/g.test(s);\nz = `a ${ {k: `in\n  ner`}.k }`;'
+
+
+def test_minify_js_returns_source_unchanged_when_it_cannot_scan():
+    js = '  x = "unterminated\n  y = 1;'
+    assert minify_js(js) == js
+
+
+def test_minify_js_round_trips_index_html():
+    with open(INDEX_HTML, encoding='utf-8') as f:
+        source = _INLINE_SCRIPT_RE.search(f.read()).group(1)
+    minified = minify_js(source)
+    assert len(minified) < len(source)
+    for template in re.findall(r'`[^`]*`', source):
+        assert template in minified
+
+
+def test_minified_index_html_script_is_valid_syntax(tmp_path):
+    node = shutil.which('node')
+    if node is None:
+        pytest.skip('node is not installed')
+    with open(INDEX_HTML, encoding='utf-8') as f:
+        source = _INLINE_SCRIPT_RE.search(f.read()).group(1)
+    bundle = tmp_path / 'bundle.js'
+    bundle.write_text(minify_js(source), encoding='utf-8')
+    result = subprocess.run([node, '--check', str(bundle)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr